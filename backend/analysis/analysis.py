@@ -5,6 +5,7 @@ This module provides functions for computing summary statistics and insights
 from CSV data. Includes numeric stats, categorical summaries, and period analysis.
 """
 
+import warnings
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Any, Optional
@@ -14,6 +15,11 @@ from .preprocessing import detect_columns
 # Constants for data analysis
 ID_UNIQUENESS_THRESHOLD = 0.95
 
+# Column name patterns that suggest an ID column
+ID_COLUMN_NAMES = frozenset({'id', 'index', 'idx', 'row_number', 'rownumber', 'row', 'key'})
+ID_COLUMN_SUFFIXES = ('_id', 'id', '_key', '_idx')
+ID_COLUMN_PREFIXES = ('id_',)
+
 
 def is_id_column(col_name: str) -> bool:
     """
@@ -27,18 +33,9 @@ def is_id_column(col_name: str) -> bool:
     """
     lower_name = col_name.lower()
     return (
-        lower_name == 'id' or
-        lower_name.endswith('_id') or
-        lower_name.endswith('id') or
-        lower_name.startswith('id_') or
-        lower_name == 'index' or
-        lower_name == 'idx' or
-        lower_name == 'row_number' or
-        lower_name == 'rownumber' or
-        lower_name == 'row' or
-        lower_name == 'key' or
-        lower_name.endswith('_key') or
-        lower_name.endswith('_idx')
+        lower_name in ID_COLUMN_NAMES or
+        lower_name.endswith(ID_COLUMN_SUFFIXES) or
+        lower_name.startswith(ID_COLUMN_PREFIXES)
     )
 
 
@@ -67,23 +64,22 @@ def is_sequential_id(df: pd.DataFrame, col_name: str) -> bool:
         if len(numeric_data) < 2:
             return False
         
+        values = numeric_data.to_numpy(dtype=np.float64)
+        
         # Check if all values are integers using modulo for better precision
-        if not all(numeric_data.apply(lambda x: x % 1 == 0)):
+        if not np.all(np.mod(values, 1) == 0):
             return False
     except Exception:
         return False
     
-    # Check if values are sequential starting from 0 or 1
-    sorted_vals = sorted(numeric_data.values)
-    is_sequential = all(
-        sorted_vals[i] - sorted_vals[i-1] == 1 
-        for i in range(1, len(sorted_vals))
-    )
-    
-    if is_sequential and (sorted_vals[0] == 0 or sorted_vals[0] == 1):
-        return True
+    # Check if values are sequential starting from 0 or 1: the range must
+    # span exactly len - 1 and every offset in it must occur exactly once
+    start = values.min()
+    if start not in (0, 1) or values.max() - start != len(values) - 1:
+        return False
     
-    return False
+    offsets = (values - start).astype(np.int64)
+    return bool(np.all(np.bincount(offsets, minlength=len(values)) == 1))
 
 
 def compute_numeric_stats(df: pd.DataFrame, numeric_cols: List[str]) -> Dict[str, Dict[str, Any]]:
@@ -101,18 +97,53 @@ def compute_numeric_stats(df: pd.DataFrame, numeric_cols: List[str]) -> Dict[str
     """
     stats = {}
     
-    for col in numeric_cols:
-        col_data = df[col].dropna()
-        if len(col_data) > 0:
+    if not numeric_cols:
+        return stats
+    
+    numeric_df = df[numeric_cols]
+    
+    if all(isinstance(dtype, np.dtype) and dtype.kind in 'iuf' for dtype in numeric_df.dtypes):
+        # Plain int/float columns: reduce one contiguous float64 block with
+        # NaN-aware NumPy reductions, one row per column
+        values = numeric_df.to_numpy(dtype=np.float64)
+        with warnings.catch_warnings():
+            # All-NaN columns warn here; they are dropped below via count == 0
+            warnings.simplefilter('ignore', RuntimeWarning)
+            agg_df = pd.DataFrame({
+                'mean': np.nanmean(values, axis=0),
+                'median': np.nanmedian(values, axis=0),
+                'std': np.nanstd(values, axis=0, ddof=1),
+                'min': np.nanmin(values, axis=0),
+                'max': np.nanmax(values, axis=0),
+                'count': (~np.isnan(values)).sum(axis=0),
+                'sum': np.nansum(values, axis=0)
+            }, index=numeric_cols)
+    else:
+        # Mixed or extension dtypes: let pandas compute all reductions in
+        # one vectorized pass, one row per column
+        agg_df = numeric_df.agg(['mean', 'median', 'std', 'min', 'max', 'count', 'sum']).T
+    agg_df['std'] = agg_df['std'].fillna(0)
+    agg_df = agg_df.round(2)
+    
+    for col, row in agg_df.iterrows():
+        count = int(row['count'])
+        if count > 0:
+            # Only run the full sequential check when min/max/count already
+            # describe a 0- or 1-based range with one slot per value
+            could_be_sequential = bool(
+                row['min'] in (0, 1) and row['max'] - row['min'] == count - 1
+            )
             stats[col] = {
-                'mean': round(float(col_data.mean()), 2),
-                'median': round(float(col_data.median()), 2),
-                'std': round(float(col_data.std()), 2) if len(col_data) > 1 else 0,
-                'min': round(float(col_data.min()), 2),
-                'max': round(float(col_data.max()), 2),
-                'count': int(col_data.count()),
-                'sum': round(float(col_data.sum()), 2),
-                'is_id_column': is_id_column(col) or is_sequential_id(df, col)
+                'mean': float(row['mean']),
+                'median': float(row['median']),
+                'std': float(row['std']) if count > 1 else 0,
+                'min': float(row['min']),
+                'max': float(row['max']),
+                'count': count,
+                'sum': float(row['sum']),
+                'is_id_column': is_id_column(col) or (
+                    could_be_sequential and is_sequential_id(df, col)
+                )
             }
     
     return stats
@@ -134,20 +165,25 @@ def compute_categorical_stats(df: pd.DataFrame, categorical_cols: List[str]) ->
     stats = {}
     
     for col in categorical_cols:
+        # Name-matched ID columns are skipped without scanning their values
+        if is_id_column(col):
+            continue
+        
         col_data = df[col].dropna()
         if len(col_data) > 0:
-            value_counts = col_data.value_counts()
             unique_count = int(col_data.nunique())
             
             # Skip if it looks like an ID column (very high unique count)
-            is_likely_id = is_id_column(col) or (unique_count / len(col_data) > ID_UNIQUENESS_THRESHOLD)
+            is_likely_id = unique_count / len(col_data) > ID_UNIQUENESS_THRESHOLD
             
             if not is_likely_id:
+                # Only count values for columns that will be reported
+                value_counts = col_data.value_counts(sort=True).head(10)
                 stats[col] = {
                     'unique_count': unique_count,
                     'most_common': str(value_counts.index[0]) if len(value_counts) > 0 else None,
                     'most_common_count': int(value_counts.iloc[0]) if len(value_counts) > 0 else 0,
-                    'top_values': {str(k): int(v) for k, v in value_counts.head(10).items()}
+                    'top_values': {str(k): int(v) for k, v in value_counts.items()}
                 }
     
     return stats
@@ -175,47 +211,69 @@ def analyze_date_periods(df: pd.DataFrame, date_cols: List[str], numeric_cols: L
     
     date_col = date_cols[0]
     
-    for num_col in numeric_cols:
-        # Create a copy to avoid modifying original
-        temp_df = df[[date_col, num_col]].dropna()
+    dates = df[date_col].array
+    values = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    # Only rows with a date can be attributed to a period, so blank out the
+    # values of undated rows instead of copying the dated subset
+    dated = ~pd.isna(dates)
+    if not dated.all():
+        values = np.where(dated[:, np.newaxis], values, np.nan)
+    
+    has_values = ~np.isnan(values).all(axis=0)
+    if not has_values.any():
+        return period_analysis
+    
+    value_cols = numeric_cols
+    if not has_values.all():
+        value_cols = [col for col, keep in zip(numeric_cols, has_values) if keep]
+        values = values[:, has_values]
+    
+    # Find best and worst row positions for all numeric columns at once
+    best_pos = np.nanargmax(values, axis=0)
+    worst_pos = np.nanargmin(values, axis=0)
+    
+    # Monthly aggregation if possible: parse dates once (not at all when
+    # detect_columns already saw datetime64) and average every numeric
+    # column in a single groupby (undated rows fall out of it as NaT)
+    try:
+        parsed_dates = df[date_col]
+        if not pd.api.types.is_datetime64_any_dtype(parsed_dates):
+            parsed_dates = pd.to_datetime(parsed_dates, errors='coerce')
+        months = parsed_dates.dt.to_period('M')
+        monthly_all = df[value_cols].groupby(months).mean()
+    except Exception:
+        # Monthly aggregation failed, skip
+        monthly_all = None
+    
+    for j, num_col in enumerate(value_cols):
+        best = best_pos[j]
+        worst = worst_pos[j]
         
-        if len(temp_df) == 0:
-            continue
+        period_analysis[num_col] = {
+            'best_period': {
+                'date': str(dates[best]),
+                'value': round(float(values[best, j]), 2)
+            },
+            'worst_period': {
+                'date': str(dates[worst]),
+                'value': round(float(values[worst, j]), 2)
+            }
+        }
         
-        # Find best and worst periods
-        if len(temp_df) > 0:
-            best_idx = temp_df[num_col].idxmax()
-            worst_idx = temp_df[num_col].idxmin()
-            
-            period_analysis[num_col] = {
-                'best_period': {
-                    'date': str(temp_df.loc[best_idx, date_col]),
-                    'value': round(float(temp_df.loc[best_idx, num_col]), 2)
-                },
-                'worst_period': {
-                    'date': str(temp_df.loc[worst_idx, date_col]),
-                    'value': round(float(temp_df.loc[worst_idx, num_col]), 2)
+        if monthly_all is not None:
+            monthly = monthly_all[num_col].dropna()
+            if len(monthly) > 0:
+                best_month = monthly.idxmax()
+                worst_month = monthly.idxmin()
+                period_analysis[num_col]['best_month'] = {
+                    'month': str(best_month),
+                    'avg_value': round(float(monthly[best_month]), 2)
+                }
+                period_analysis[num_col]['worst_month'] = {
+                    'month': str(worst_month),
+                    'avg_value': round(float(monthly[worst_month]), 2)
                 }
-            }
-            
-            # Monthly aggregation if possible
-            try:
-                temp_df['month'] = pd.to_datetime(temp_df[date_col]).dt.to_period('M')
-                monthly = temp_df.groupby('month')[num_col].mean()
-                if len(monthly) > 0:
-                    best_month = monthly.idxmax()
-                    worst_month = monthly.idxmin()
-                    period_analysis[num_col]['best_month'] = {
-                        'month': str(best_month),
-                        'avg_value': round(float(monthly[best_month]), 2)
-                    }
-                    period_analysis[num_col]['worst_month'] = {
-                        'month': str(worst_month),
-                        'avg_value': round(float(monthly[worst_month]), 2)
-                    }
-            except Exception:
-                # Monthly aggregation failed, skip
-                pass
     
     return period_analysis
 
@@ -234,19 +292,38 @@ def compute_correlations(df: pd.DataFrame, numeric_cols: List[str]) -> Dict[str,
     if len(numeric_cols) < 2:
         return {}
     
-    corr_df = df[numeric_cols].corr()
+    values = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    if np.isnan(values).any():
+        # Missing values need pandas' pairwise-complete correlation
+        corr = df[numeric_cols].corr().to_numpy()
+    else:
+        # Constant columns have no defined correlation; leave them as NaN
+        # and only feed the varying columns to corrcoef
+        varying = np.ptp(values, axis=0) > 0
+        corr = np.full((len(numeric_cols), len(numeric_cols)), np.nan)
+        if varying.any():
+            corr[np.ix_(varying, varying)] = np.corrcoef(values[:, varying], rowvar=False)
+    
+    # The matrix is symmetric, so round the upper triangle once and mirror it
+    n = len(numeric_cols)
+    upper = np.triu_indices(n, k=1)
+    rounded = np.empty((n, n))
+    rounded[upper] = np.round(corr[upper], 3)
+    rounded[upper[::-1]] = rounded[upper]
+    np.fill_diagonal(rounded, np.round(np.diag(corr), 3))
     
     # Convert to nested dictionary
-    correlations = {}
-    for col1 in corr_df.columns:
-        correlations[col1] = {}
-        for col2 in corr_df.columns:
-            correlations[col1][col2] = round(float(corr_df.loc[col1, col2]), 3)
+    correlations = {
+        col: dict(zip(numeric_cols, row))
+        for col, row in zip(numeric_cols, rounded.tolist())
+    }
     
     return correlations
 
 
-def compute_summary(df: pd.DataFrame) -> Dict[str, Any]:
+def compute_summary(df: pd.DataFrame,
+                    column_types: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
     """
     Main function to compute comprehensive summary of the DataFrame.
     
@@ -254,6 +331,7 @@ def compute_summary(df: pd.DataFrame) -> Dict[str, Any]:
     
     Args:
         df: Input DataFrame
+        column_types: Result of detect_columns(df), computed if not given
         
     Returns:
         Dictionary containing:
@@ -264,7 +342,8 @@ def compute_summary(df: pd.DataFrame) -> Dict[str, Any]:
         - correlations: Correlation matrix for numeric columns
     """
     # Detect column types
-    column_types = detect_columns(df)
+    if column_types is None:
+        column_types = detect_columns(df)
     
     # Build comprehensive summary
     summary = {
@@ -304,16 +383,18 @@ def get_quick_insights(summary: Dict[str, Any]) -> List[str]:
     
     # Numeric insights - exclude ID columns
     numeric_stats = summary.get('numeric_stats', {})
-    for col, stats in numeric_stats.items():
-        if not stats.get('is_id_column', False):
-            insights.append(f"{col}: ranges from {stats['min']:,} to {stats['max']:,} (avg: {stats['mean']:,})")
+    insights.extend(
+        f"{col}: ranges from {stats['min']:,} to {stats['max']:,} (avg: {stats['mean']:,})"
+        for col, stats in numeric_stats.items()
+        if not stats.get('is_id_column', False)
+    )
     
-    # Best/worst period insights - exclude ID columns
+    # Best/worst period insights - exclude ID columns (as flagged in numeric_stats)
     period_analysis = summary.get('period_analysis', {})
-    for col, periods in period_analysis.items():
-        # Check if this column is an ID in numeric_stats
-        is_id = numeric_stats.get(col, {}).get('is_id_column', False)
-        if not is_id and 'best_period' in periods:
-            insights.append(f"Best {col}: {periods['best_period']['value']:,} on {periods['best_period']['date']}")
+    insights.extend(
+        f"Best {col}: {periods['best_period']['value']:,} on {periods['best_period']['date']}"
+        for col, periods in period_analysis.items()
+        if not numeric_stats.get(col, {}).get('is_id_column', False) and 'best_period' in periods
+    )
     
     return insights
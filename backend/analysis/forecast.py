@@ -10,6 +10,18 @@ import numpy as np
 from typing import Dict, List, Any, Optional, Tuple
 from .preprocessing import detect_columns
 
+# Numba is optional; without it fit_linear_trend uses the NumPy functions
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+NANOSECONDS_PER_DAY = 86_400_000_000_000
+
+# Number of most recent historical points included in a forecast response
+HISTORICAL_POINTS = 20
+
 
 def prepare_forecast_data(df: pd.DataFrame, date_col: str, value_col: str) -> Tuple[np.ndarray, np.ndarray, pd.Series]:
     """
@@ -23,20 +35,43 @@ def prepare_forecast_data(df: pd.DataFrame, date_col: str, value_col: str) -> Tu
     Returns:
         Tuple of (X values as days from start, Y values, date series)
     """
+    X, Y, dates = prepare_forecast_matrix(df, date_col, [value_col])
+    return X, Y[:, 0], dates
+
+
+def prepare_forecast_matrix(df: pd.DataFrame, date_col: str, value_cols: List[str]) -> Tuple[np.ndarray, np.ndarray, pd.Series]:
+    """
+    Prepare several value columns for forecasting against one shared date axis.
+    
+    Rows missing the date or any of the values are dropped.
+    
+    Args:
+        df: Input DataFrame
+        date_col: Name of the date column
+        value_cols: Names of the numeric value columns
+        
+    Returns:
+        Tuple of (X values as days from start, Y matrix with one column per
+        value column, date series)
+    """
     # Create a clean copy with only needed columns
-    forecast_df = df[[date_col, value_col]].dropna().copy()
+    forecast_df = df[[date_col] + list(value_cols)].dropna().copy()
     
     if len(forecast_df) == 0:
         raise ValueError("No valid data points for forecasting")
     
-    # Sort by date
-    forecast_df = forecast_df.sort_values(date_col)
+    # Parse dates first so sorting compares datetime64 values, and skip the
+    # sort entirely when the data already arrives in date order
+    forecast_df[date_col] = pd.to_datetime(forecast_df[date_col])
+    if not forecast_df[date_col].is_monotonic_increasing:
+        forecast_df = forecast_df.sort_values(date_col)
     
-    # Convert dates to numeric (days from start)
-    dates = pd.to_datetime(forecast_df[date_col])
-    start_date = dates.min()
-    X = (dates - start_date).dt.days.values.astype(float)
-    Y = forecast_df[value_col].values.astype(float)
+    # Convert dates to numeric (whole days from start), working on the raw
+    # int64 nanoseconds instead of going through Timedelta arithmetic
+    dates = forecast_df[date_col]
+    ns = dates.to_numpy(dtype='datetime64[ns]').view('i8')
+    X = ((ns - ns[0]) // NANOSECONDS_PER_DAY).astype(np.float64)
+    Y = forecast_df[value_cols].to_numpy(dtype=np.float64)
     
     return X, Y, dates
 
@@ -47,6 +82,9 @@ def linear_regression(X: np.ndarray, Y: np.ndarray) -> Tuple[float, float]:
     
     Formula: Y = slope * X + intercept
     
+    Y may also be 2-D with one column per series sharing the same X, in
+    which case all series are fitted at once and arrays are returned.
+    
     Args:
         X: Independent variable values
         Y: Dependent variable values
@@ -59,19 +97,20 @@ def linear_regression(X: np.ndarray, Y: np.ndarray) -> Tuple[float, float]:
     if n < 2:
         raise ValueError("Need at least 2 data points for regression")
     
-    # Calculate means
-    x_mean = np.mean(X)
-    y_mean = np.mean(Y)
+    # Calculate slope and intercept from raw sums (no centered copies);
+    # np.dot runs the products and accumulation as a single BLAS call
+    sum_x = X.sum()
+    sum_y = Y.sum(axis=0)
+    sum_xy = np.dot(X, Y)
+    sum_xx = np.dot(X, X)
     
-    # Calculate slope and intercept using least squares
-    numerator = np.sum((X - x_mean) * (Y - y_mean))
-    denominator = np.sum((X - x_mean) ** 2)
+    denominator = n * sum_xx - sum_x * sum_x
     
-    if denominator == 0:
+    if denominator <= 0:
         raise ValueError("Cannot compute regression with zero variance in X")
     
-    slope = numerator / denominator
-    intercept = y_mean - slope * x_mean
+    slope = (n * sum_xy - sum_x * sum_y) / denominator
+    intercept = (sum_y - slope * sum_x) / n
     
     return slope, intercept
 
@@ -80,6 +119,8 @@ def calculate_r_squared(Y_actual: np.ndarray, Y_predicted: np.ndarray) -> float:
     """
     Calculate R-squared (coefficient of determination).
     
+    For 2-D inputs, R-squared is computed per column and returned as an array.
+    
     Args:
         Y_actual: Actual Y values
         Y_predicted: Predicted Y values
@@ -87,8 +128,16 @@ def calculate_r_squared(Y_actual: np.ndarray, Y_predicted: np.ndarray) -> float:
     Returns:
         R-squared value (0 to 1, higher is better fit)
     """
-    ss_res = np.sum((Y_actual - Y_predicted) ** 2)
-    ss_tot = np.sum((Y_actual - np.mean(Y_actual)) ** 2)
+    # Square-and-sum each difference in one fused pass (per column for 2-D),
+    # so no squared temporaries are allocated
+    residuals = Y_actual - Y_predicted
+    ss_res = np.einsum('i...,i...->...', residuals, residuals)
+    deviations = Y_actual - Y_actual.mean(axis=0)
+    ss_tot = np.einsum('i...,i...->...', deviations, deviations)
+    
+    if np.ndim(ss_tot) > 0:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(ss_tot == 0, 0.0, 1 - ss_res / ss_tot)
     
     if ss_tot == 0:
         return 0.0
@@ -96,6 +145,77 @@ def calculate_r_squared(Y_actual: np.ndarray, Y_predicted: np.ndarray) -> float:
     return 1 - (ss_res / ss_tot)
 
 
+def _fit_line_loop(X: np.ndarray, Y: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Fit slope, intercept and R-squared with plain loops (compiled by Numba).
+    
+    Returns NaN for all three values when X has zero variance.
+    """
+    n = X.shape[0]
+    
+    sum_x = 0.0
+    sum_y = 0.0
+    for i in range(n):
+        sum_x += X[i]
+        sum_y += Y[i]
+    x_mean = sum_x / n
+    y_mean = sum_y / n
+    
+    sxx = 0.0
+    sxy = 0.0
+    syy = 0.0
+    for i in range(n):
+        dx = X[i] - x_mean
+        dy = Y[i] - y_mean
+        sxx += dx * dx
+        sxy += dx * dy
+        syy += dy * dy
+    
+    if sxx == 0:
+        return np.nan, np.nan, np.nan
+    
+    slope = sxy / sxx
+    intercept = y_mean - slope * x_mean
+    
+    # For a least squares fit, 1 - ss_res / ss_tot reduces to sxy^2 / (sxx * syy)
+    r_squared = 0.0 if syy == 0 else (sxy * sxy) / (sxx * syy)
+    
+    return slope, intercept, r_squared
+
+
+_fit_line_compiled = njit(cache=True)(_fit_line_loop) if njit is not None else None
+
+
+def fit_linear_trend(X: np.ndarray, Y: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Fit a linear trend and compute its R-squared in one call.
+    
+    Uses a single compiled loop when Numba is installed, which avoids the
+    per-call NumPy overhead that dominates on short series. Otherwise falls
+    back to linear_regression() and calculate_r_squared().
+    
+    Args:
+        X: Independent variable values
+        Y: Dependent variable values
+        
+    Returns:
+        Tuple of (slope, intercept, r_squared)
+    """
+    if _fit_line_compiled is None:
+        slope, intercept = linear_regression(X, Y)
+        return slope, intercept, calculate_r_squared(Y, slope * X + intercept)
+    
+    if len(X) < 2:
+        raise ValueError("Need at least 2 data points for regression")
+    
+    slope, intercept, r_squared = _fit_line_compiled(X, Y)
+    
+    if np.isnan(slope):
+        raise ValueError("Cannot compute regression with zero variance in X")
+    
+    return slope, intercept, r_squared
+
+
 def simple_forecast(df: pd.DataFrame, periods: int = 5, value_col: Optional[str] = None) -> Dict[str, Any]:
     """
     Perform simple linear regression forecast on the dataset.
@@ -165,20 +285,22 @@ def simple_forecast(df: pd.DataFrame, periods: int = 5, value_col: Optional[str]
             }
         
         # Perform linear regression
-        slope, intercept = linear_regression(X, Y)
+        slope, intercept, r_squared = fit_linear_trend(X, Y)
         
         # Calculate predictions for historical data
         Y_predicted = slope * X + intercept
-        r_squared = calculate_r_squared(Y, Y_predicted)
         
-        # Generate historical data points
-        historical = []
-        for i in range(len(X)):
-            historical.append({
-                'date': str(dates.iloc[i]),
-                'actual': round(float(Y[i]), 2),
-                'predicted': round(float(Y_predicted[i]), 2)
-            })
+        # Generate historical data points (only the last ones are returned,
+        # so slice before formatting)
+        recent = slice(-HISTORICAL_POINTS, None)
+        historical = [
+            {'date': str(date), 'actual': actual, 'predicted': predicted}
+            for date, actual, predicted in zip(
+                dates.iloc[recent],
+                np.round(Y[recent], 2).tolist(),
+                np.round(Y_predicted[recent], 2).tolist()
+            )
+        ]
         
         # Generate future forecasts
         last_x = X[-1]
@@ -213,8 +335,8 @@ def simple_forecast(df: pd.DataFrame, periods: int = 5, value_col: Optional[str]
                 'r_squared': round(float(r_squared), 4),
                 'interpretation': f"For each day, {value_col} changes by {round(slope, 4)}"
             },
-            'historical_count': len(historical),
-            'historical': historical[-20:],  # Last 20 points to avoid huge response
+            'historical_count': len(X),
+            'historical': historical,  # Last points only to avoid huge response
             'forecast': forecast
         }
         
@@ -225,6 +347,66 @@ def simple_forecast(df: pd.DataFrame, periods: int = 5, value_col: Optional[str]
         }
 
 
+def forecast_columns(df: pd.DataFrame, date_col: str, value_cols: List[str], periods: int = 5) -> Dict[str, Dict[str, Any]]:
+    """
+    Forecast several numeric columns that share one date axis.
+    
+    All columns are fitted in a single vectorized regression, so rows
+    missing any of the values are dropped for every column.
+    
+    Args:
+        df: Input DataFrame
+        date_col: Name of the date column
+        value_cols: Names of the numeric columns to forecast
+        periods: Number of future periods to forecast
+        
+    Returns:
+        Dictionary with a forecast result per column
+    """
+    try:
+        X, Y, dates = prepare_forecast_matrix(df, date_col, value_cols)
+        
+        if len(X) < 2:
+            return {
+                value_col: {'success': False, 'error': 'Not enough data points'}
+                for value_col in value_cols
+            }
+        
+        slopes, intercepts = linear_regression(X, Y)
+        Y_predicted = np.outer(X, slopes) + intercepts
+        r_squared = calculate_r_squared(Y, Y_predicted)
+        
+        # Generate future forecasts for all columns at once
+        last_x = X[-1]
+        last_date = dates.iloc[-1]
+        avg_interval = (X[-1] - X[0]) / (len(X) - 1) if len(X) > 1 else 1
+        
+        steps = range(1, periods + 1)
+        future_dates = [str(last_date + pd.Timedelta(days=int(avg_interval * i))) for i in steps]
+        future_x = last_x + avg_interval * np.arange(1, periods + 1)
+        future_Y = np.round(np.outer(future_x, slopes) + intercepts, 2)
+        
+    except Exception as e:
+        return {
+            value_col: {'success': False, 'error': str(e)}
+            for value_col in value_cols
+        }
+    
+    forecasts = {}
+    for j, value_col in enumerate(value_cols):
+        forecasts[value_col] = {
+            'success': True,
+            'r_squared': round(float(r_squared[j]), 4),
+            'trend': 'increasing' if slopes[j] > 0 else 'decreasing',
+            'forecast': [
+                {'date': date, 'predicted': float(value)}
+                for date, value in zip(future_dates, future_Y[:, j])
+            ]
+        }
+    
+    return forecasts
+
+
 def forecast_all_numeric(df: pd.DataFrame, periods: int = 5) -> Dict[str, Any]:
     """
     Forecast all numeric columns against the date column.
@@ -245,53 +427,24 @@ def forecast_all_numeric(df: pd.DataFrame, periods: int = 5) -> Dict[str, Any]:
         }
     
     date_col = column_types['date'][0]
+    numeric_cols = column_types['numeric']
+    
+    # Columns without gaps on dated rows share the same X values and are
+    # fitted together; columns with gaps keep their own rows
+    complete = df.loc[df[date_col].notna(), numeric_cols].notna().all()
+    shared_cols = [col for col in numeric_cols if complete[col]]
+    
+    forecasts = {}
+    if shared_cols:
+        forecasts.update(forecast_columns(df, date_col, shared_cols, periods))
+    for value_col in numeric_cols:
+        if value_col not in forecasts:
+            forecasts.update(forecast_columns(df, date_col, [value_col], periods))
+    
     results = {
         'date_column': date_col,
-        'forecasts': {}
+        'forecasts': {col: forecasts[col] for col in numeric_cols}
     }
     
-    for value_col in column_types['numeric']:
-        try:
-            X, Y, dates = prepare_forecast_data(df, date_col, value_col)
-            
-            if len(X) < 2:
-                results['forecasts'][value_col] = {
-                    'success': False,
-                    'error': 'Not enough data points'
-                }
-                continue
-            
-            slope, intercept = linear_regression(X, Y)
-            Y_predicted = slope * X + intercept
-            r_squared = calculate_r_squared(Y, Y_predicted)
-            
-            # Generate future forecasts
-            last_x = X[-1]
-            last_date = dates.iloc[-1]
-            avg_interval = (X[-1] - X[0]) / (len(X) - 1) if len(X) > 1 else 1
-            
-            forecast = []
-            for i in range(1, periods + 1):
-                future_x = last_x + (avg_interval * i)
-                future_y = slope * future_x + intercept
-                future_date = last_date + pd.Timedelta(days=int(avg_interval * i))
-                forecast.append({
-                    'date': str(future_date),
-                    'predicted': round(float(future_y), 2)
-                })
-            
-            results['forecasts'][value_col] = {
-                'success': True,
-                'r_squared': round(float(r_squared), 4),
-                'trend': 'increasing' if slope > 0 else 'decreasing',
-                'forecast': forecast
-            }
-            
-        except Exception as e:
-            results['forecasts'][value_col] = {
-                'success': False,
-                'error': str(e)
-            }
-    
     results['success'] = any(f.get('success', False) for f in results['forecasts'].values())
     return results
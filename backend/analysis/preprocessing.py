@@ -5,9 +5,93 @@ This module provides functions for cleaning and preparing CSV data for analysis.
 Includes column standardization, missing value handling, and date detection.
 """
 
+import re
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Any
+
+
+# Characters stripped from column names: anything that is neither a word
+# character nor whitespace. ASCII names use a translate table built from the
+# same rule as the regex used for other names
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_NON_WORD_TABLE = str.maketrans('', '', ''.join(
+    char for char in map(chr, range(128)) if _NON_WORD_RE.match(char)
+))
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Formats tried, in order, before falling back to per-value format inference.
+# Month-first comes before day-first to match pandas' default. Only used on
+# pandas >= 2, which applies one inferred format to the whole column anyway;
+# earlier versions parse each value separately, so pinning a format there
+# would turn values in any other format into NaT
+PANDAS_INFERS_COLUMN_FORMAT = int(pd.__version__.split('.')[0]) >= 2
+DATE_FORMATS = (
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y/%m/%d',
+    '%m/%d/%Y',
+    '%d/%m/%Y',
+    '%m-%d-%Y',
+    '%d.%m.%Y',
+)
+
+# Column names suggesting a date column ('timestamp' is covered by 'time')
+_DATE_KEYWORD_RE = re.compile(r'date|time|created|updated|day|month|year', re.IGNORECASE)
+
+# Cheap check run before any real date parsing. It only rules out values that
+# cannot be dates (no digit at all, or far too long), so every format the
+# parser understands (05-Jan-2024, Jan 2024, RFC 2822, ...) still gets probed
+_DIGIT_RE = re.compile(r'\d')
+DATE_MAX_LENGTH = 64
+
+
+def _normalize_column_name(name: str) -> str:
+    """
+    Lowercase a column name, drop punctuation and join words with underscores.
+    """
+    name = name.lower().strip()
+    
+    # A single translate handles ASCII names; other names need the Unicode
+    # aware regex to decide what counts as a word character
+    if name.isascii():
+        name = name.translate(_NON_WORD_TABLE)
+    else:
+        name = _NON_WORD_RE.sub('', name)
+    
+    return _WHITESPACE_RE.sub('_', name)
+
+
+def _infer_date_format(sample: List[Any]) -> Optional[str]:
+    """
+    Find the first of DATE_FORMATS that parses the sample exactly like
+    pandas' format inference does, so passing it on changes no values.
+    Always None on pandas < 2 (see PANDAS_INFERS_COLUMN_FORMAT).
+    """
+    if not PANDAS_INFERS_COLUMN_FORMAT:
+        return None
+    expected = pd.to_datetime(sample, errors='coerce')
+    if expected.isna().all():
+        return None
+    for date_format in DATE_FORMATS:
+        if pd.to_datetime(sample, format=date_format, errors='coerce').equals(expected):
+            return date_format
+    return None
+
+
+def _first_non_null(series: pd.Series, n: int) -> List[Any]:
+    """
+    Collect the first n non-null values of a Series.
+    
+    The first rows usually hold enough values, so the full-column dropna()
+    only runs for columns that start out sparse.
+    """
+    sample = series.head(5 * n).dropna()
+    if len(sample) < n and len(series) > 5 * n:
+        sample = series.dropna()
+    return sample.head(n).tolist()
 
 
 def standardize_column_names(df: pd.DataFrame) -> pd.DataFrame:
@@ -20,22 +104,27 @@ def standardize_column_names(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with standardized column names
     """
-    # Convert column names to lowercase and replace spaces/special chars with underscores
-    new_columns = (
-        df.columns
-        .str.lower()
-        .str.strip()
-        .str.replace(r'[^\w\s]', '', regex=True)
-        .str.replace(r'\s+', '_', regex=True)
-    )
-    
-    # Handle empty column names by assigning default names
+    # Convert column names to lowercase and replace spaces/special chars with
+    # underscores, handling empty column names by assigning default names
     new_columns = [
-        col if col else f'column_{i}' 
-        for i, col in enumerate(new_columns)
+        _normalize_column_name(str(col)) or f'column_{i}'
+        for i, col in enumerate(df.columns)
     ]
     
-    df.columns = new_columns
+    # Names that collide after normalization ('Sales' and 'sales ') get a
+    # numeric suffix, since duplicate labels break column lookups later on
+    taken = set(new_columns)
+    seen = set()
+    for i, name in enumerate(new_columns):
+        if name in seen:
+            suffix = 1
+            while f'{name}_{suffix}' in taken:
+                suffix += 1
+            new_columns[i] = f'{name}_{suffix}'
+            taken.add(new_columns[i])
+        seen.add(new_columns[i])
+    
+    df.columns = pd.Index(new_columns, dtype='object', copy=False)
     return df
 
 
@@ -53,21 +142,83 @@ def handle_missing_values(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with missing values handled
     """
-    for col in df.columns:
-        if df[col].dtype in ['int64', 'float64']:
-            # Fill numeric columns with median
-            median_val = df[col].median()
-            df[col] = df[col].fillna(median_val)
+    # Only columns that actually contain gaps need filling
+    missing_counts = len(df) - df.count()
+    missing_cols = list(missing_counts[missing_counts > 0].index)
+    
+    numeric_cols = []
+    other_cols = []
+    for col in missing_cols:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            numeric_cols.append(col)
         else:
-            # Fill categorical columns with mode or 'Unknown'
-            if df[col].mode().empty:
-                df[col] = df[col].fillna('Unknown')
-            else:
-                df[col] = df[col].fillna(df[col].mode().iloc[0])
+            other_cols.append(col)
+    
+    if numeric_cols:
+        # Fill numeric columns with median, all columns in one call
+        df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].median())
+    
+    if other_cols:
+        # Fill categorical columns with mode or 'Unknown'
+        modes = df[other_cols].mode(dropna=True)
+        fill_values = {}
+        for col in other_cols:
+            mode_val = modes[col].iloc[0] if len(modes) > 0 else None
+            fill_values[col] = 'Unknown' if pd.isna(mode_val) else mode_val
+        df[other_cols] = df[other_cols].fillna(fill_values)
+    
     return df
 
 
-def parse_dates(df: pd.DataFrame) -> pd.DataFrame:
+def find_date_columns(df: pd.DataFrame) -> List[str]:
+    """
+    Find the text columns that should be parsed as dates.
+    
+    A column qualifies when its name suggests a date, or when most of a
+    small sample of its values parses as dates.
+    
+    Args:
+        df: Input DataFrame
+        
+    Returns:
+        List of date column names
+    """
+    date_columns = []
+    
+    for col in df.columns:
+        # Only check object (string) columns
+        if df[col].dtype != 'object':
+            continue
+        
+        # Check if column name suggests it's a date
+        if _DATE_KEYWORD_RE.search(col):
+            date_columns.append(col)
+            continue
+        
+        # Try to parse if it looks like a date format
+        sample = _first_non_null(df[col], 10)
+        if len(sample) > 0:
+            # Skip the parser entirely unless most of the sample
+            # could be a date
+            hits = sum(
+                1 for value in map(str, sample)
+                if len(value) <= DATE_MAX_LENGTH and _DIGIT_RE.search(value)
+            )
+            if hits / len(sample) <= 0.5:
+                continue
+            try:
+                # Attempt to parse the first few values
+                test_parse = pd.to_datetime(sample, errors='coerce')
+                # If more than 50% parsed successfully, treat it as a date column
+                if test_parse.notna().sum() / len(sample) > 0.5:
+                    date_columns.append(col)
+            except Exception:
+                pass
+    
+    return date_columns
+
+
+def parse_dates(df: pd.DataFrame, date_columns: Optional[List[str]] = None) -> pd.DataFrame:
     """
     Attempt to parse date columns in the DataFrame.
     
@@ -75,38 +226,73 @@ def parse_dates(df: pd.DataFrame) -> pd.DataFrame:
     
     Args:
         df: Input DataFrame
+        date_columns: Columns to convert (optional, found with
+            find_date_columns() when not given)
         
     Returns:
         DataFrame with date columns parsed
     """
-    for col in df.columns:
-        # Skip if already datetime
-        if pd.api.types.is_datetime64_any_dtype(df[col]):
-            continue
-            
-        # Only check object (string) columns
-        if df[col].dtype == 'object':
-            # Check if column name suggests it's a date
-            date_keywords = ['date', 'time', 'timestamp', 'created', 'updated', 'day', 'month', 'year']
-            is_date_column = any(keyword in col.lower() for keyword in date_keywords)
-            
-            if is_date_column:
-                try:
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
-                except Exception:
-                    pass
-            else:
-                # Try to parse if it looks like a date format
-                sample = df[col].dropna().head(10)
-                if len(sample) > 0:
-                    try:
-                        # Attempt to parse the first few values
-                        test_parse = pd.to_datetime(sample, errors='coerce')
-                        # If more than 50% parsed successfully, convert the whole column
-                        if test_parse.notna().sum() / len(sample) > 0.5:
-                            df[col] = pd.to_datetime(df[col], errors='coerce')
-                    except Exception:
-                        pass
+    if date_columns is None:
+        date_columns = find_date_columns(df)
+    
+    for col in date_columns:
+        try:
+            # A known format skips pandas' per-value format inference
+            date_format = _infer_date_format(_first_non_null(df[col], 10))
+            df[col] = pd.to_datetime(df[col], format=date_format, errors='coerce')
+        except Exception:
+            pass
+    return df
+
+
+def downcast_numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store numeric columns in the narrowest dtype that holds their values.
+    
+    Integers are downcast to the smallest integer type that fits. Floats are
+    only narrowed to float32 when every value survives the round trip
+    exactly, so no precision is lost.
+    
+    Args:
+        df: Input DataFrame
+        
+    Returns:
+        DataFrame with numeric columns downcast
+    """
+    for col in df.select_dtypes(include='integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    
+    for col in df.select_dtypes(include='floating').columns:
+        narrowed = pd.to_numeric(df[col], downcast='float')
+        if narrowed.dtype != df[col].dtype and narrowed.astype(df[col].dtype).equals(df[col]):
+            df[col] = narrowed
+    
+    return df
+
+
+def convert_string_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store text columns as Arrow-backed strings when pyarrow is installed.
+    
+    Arrow strings live in one contiguous buffer instead of one Python object
+    per cell, so groupby, value_counts and nunique run in native code and use
+    less memory. Object columns holding anything other than strings are left
+    unchanged.
+    
+    Args:
+        df: Input DataFrame
+        
+    Returns:
+        DataFrame with string columns converted
+    """
+    try:
+        string_dtype = pd.StringDtype('pyarrow')
+    except ImportError:
+        return df
+    
+    for col in df.select_dtypes(include='object').columns:
+        if pd.api.types.infer_dtype(df[col], skipna=True) == 'string':
+            df[col] = df[col].astype(string_dtype)
     return df
 
 
@@ -116,8 +302,10 @@ def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     
     Applies all preprocessing steps:
     1. Standardize column names
-    2. Parse date columns
-    3. Handle missing values
+    2. Downcast numeric columns
+    3. Parse date columns
+    4. Handle missing values
+    5. Convert text columns to Arrow-backed strings
     
     Args:
         df: Input DataFrame
@@ -128,12 +316,18 @@ def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     # Step 1: Standardize column names
     df = standardize_column_names(df)
     
-    # Step 2: Parse dates (before handling missing values to avoid date issues)
+    # Step 2: Downcast numeric columns (date columns are still text here)
+    df = downcast_numeric_columns(df)
+    
+    # Step 3: Parse dates (before handling missing values to avoid date issues)
     df = parse_dates(df)
     
-    # Step 3: Handle missing values
+    # Step 4: Handle missing values
     df = handle_missing_values(df)
     
+    # Step 5: Convert text columns to Arrow-backed strings
+    df = convert_string_columns(df)
+    
     return df
 
 
@@ -141,6 +335,9 @@ def detect_columns(df: pd.DataFrame) -> Dict[str, List[str]]:
     """
     Detect and categorize columns by type.
     
+    Results are cached on the column names and dtypes, so repeated calls on
+    the same DataFrame (or one with the same schema) skip the dtype checks.
+    
     Args:
         df: Input DataFrame
         
@@ -150,21 +347,32 @@ def detect_columns(df: pd.DataFrame) -> Dict[str, List[str]]:
         - 'categorical': Categorical/string columns
         - 'date': Datetime columns
     """
+    cached = _detect_column_types(tuple(df.columns), tuple(df.dtypes))
+    
+    # Return fresh lists so callers cannot modify the cached result
+    return {key: list(cols) for key, cols in cached.items()}
+
+
+@lru_cache(maxsize=32)
+def _detect_column_types(columns: Tuple[str, ...], dtypes: Tuple[Any, ...]) -> Dict[str, Tuple[str, ...]]:
+    """
+    Categorize columns from their names and dtypes (cached by detect_columns).
+    """
     result = {
         'numeric': [],
         'categorical': [],
         'date': []
     }
     
-    for col in df.columns:
-        if pd.api.types.is_datetime64_any_dtype(df[col]):
+    for col, dtype in zip(columns, dtypes):
+        if pd.api.types.is_datetime64_any_dtype(dtype):
             result['date'].append(col)
-        elif pd.api.types.is_numeric_dtype(df[col]):
+        elif pd.api.types.is_numeric_dtype(dtype):
             result['numeric'].append(col)
         else:
             result['categorical'].append(col)
     
-    return result
+    return {key: tuple(cols) for key, cols in result.items()}
 
 
 def get_dataframe_info(df: pd.DataFrame) -> Dict[str, Any]:
@@ -186,5 +394,7 @@ def get_dataframe_info(df: pd.DataFrame) -> Dict[str, Any]:
         'column_count': len(df.columns),
         'columns': list(df.columns),
         'column_types': detect_columns(df),
-        'missing_values': df.isnull().sum().to_dict()
+        # count() tallies non-null values block-wise without materializing
+        # a boolean mask the size of the data
+        'missing_values': (len(df) - df.count()).to_dict()
     }
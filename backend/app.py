@@ -8,15 +8,44 @@ Interactive Data Analytics Dashboard. It provides endpoints for:
 - Visualization generation
 - Forecasting
 
-All data is stored in memory (no database).
+All data is stored in memory (no database), separately for each browser
+session.
 """
 
 import os
+import secrets
 import sys
-from flask import Flask, request, jsonify, send_from_directory
+import threading
+from collections import OrderedDict
+from flask import Flask, g, request, jsonify, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+import orjson
 import pandas as pd
-from io import StringIO
+from plotly.utils import PlotlyJSONEncoder
+from typing import Any, Dict, List
+
+# pyarrow is optional; without it CSV files are parsed by pandas
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+# Strings read as missing values, matching pandas' read_csv defaults so the
+# pyarrow and pandas readers infer the same column types
+CSV_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null'
+]
+
+# Flask-Compress is optional; without it responses are sent uncompressed
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -26,23 +55,132 @@ from backend.analysis.analysis import compute_summary, get_quick_insights
 from backend.analysis.forecast import simple_forecast
 from backend.visualization.charts import generate_chart, get_available_charts
 
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider that serializes with orjson instead of the json module.
+    
+    NumPy arrays and scalars (as found in Plotly figure dictionaries and
+    summary statistics) are written natively; anything orjson cannot handle,
+    such as pandas Timestamps, goes through Plotly's encoder. Keys are sorted
+    like Flask's default provider does.
+    """
+    
+    sort_keys = True
+    
+    def _dumps_bytes(self, obj: Any) -> bytes:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option, default=PlotlyJSONEncoder().default)
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self._dumps_bytes(obj).decode()
+    
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any):
+        # Hand orjson's bytes to the response without a str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps_bytes(obj), mimetype='application/json')
+
+
 # Initialize Flask app
 app = Flask(__name__, static_folder='../frontend/static')
+app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for frontend requests
 
-# In-memory storage for uploaded data
-# Using a dictionary to store the DataFrame and metadata
-data_store = {
-    'df': None,
-    'filename': None,
-    'uploaded': False
-}
+# Compress JSON responses (chart data compresses well) above 1 KB
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_MIN_SIZE'] = 1024
+if Compress is not None:
+    Compress(app)
+
+# In-memory storage for uploaded data, one data store per browser session
+# keyed by the session cookie. Each data store is a dictionary holding the
+# DataFrame and metadata; once MAX_SESSIONS are stored the least recently
+# used one is dropped
+MAX_SESSIONS = 16
+SESSION_COOKIE = 'session_id'
+sessions: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+sessions_lock = threading.Lock()
 
 
 # ============================================
 # UTILITY FUNCTIONS
 # ============================================
 
+def new_data_store() -> Dict[str, Any]:
+    """
+    Create an empty data store.
+    
+    Returns:
+        Dictionary with no DataFrame or metadata set
+    """
+    return {
+        'df': None,
+        'filename': None,
+        'uploaded': False,
+        'column_types': None
+    }
+
+
+def get_session_id() -> str:
+    """
+    Retrieve the session id of the current request.
+    
+    Requests without a session cookie get a new random id, which is sent
+    back as a cookie once the request is done.
+    
+    Returns:
+        Session id string
+    """
+    if 'session_id' not in g:
+        session_id = request.cookies.get(SESSION_COOKIE)
+        if not session_id:
+            session_id = secrets.token_urlsafe(16)
+            g.new_session = True
+        g.session_id = session_id
+    return g.session_id
+
+
+def get_data_store() -> Dict[str, Any]:
+    """
+    Retrieve the data store of the current session.
+    
+    Sessions that have not uploaded anything get an empty data store that is
+    not kept, so requests without data do not evict other sessions.
+    
+    Returns:
+        Data store dictionary
+    """
+    if 'data_store' not in g:
+        session_id = get_session_id()
+        with sessions_lock:
+            store = sessions.get(session_id)
+            if store is not None:
+                sessions.move_to_end(session_id)
+        g.data_store = store if store is not None else new_data_store()
+    return g.data_store
+
+
+def save_data_store(store: Dict[str, Any]) -> None:
+    """
+    Store a data store for the current session.
+    
+    Args:
+        store: Data store dictionary replacing the session's current one
+    """
+    session_id = get_session_id()
+    with sessions_lock:
+        sessions[session_id] = store
+        sessions.move_to_end(session_id)
+        while len(sessions) > MAX_SESSIONS:
+            sessions.popitem(last=False)
+    g.data_store = store
+
+
 def get_dataframe() -> pd.DataFrame:
     """
     Retrieve the currently stored DataFrame.
@@ -50,7 +188,124 @@ def get_dataframe() -> pd.DataFrame:
     Returns:
         The stored DataFrame or None if not available
     """
-    return data_store.get('df')
+    return get_data_store().get('df')
+
+
+def get_column_types() -> Dict[str, List[str]]:
+    """
+    Retrieve the column types of the stored DataFrame.
+    
+    The result of detect_columns() is cached in the data store on upload,
+    so requests do not re-inspect every column's dtype.
+    
+    Returns:
+        Dictionary with lists of column names by type, or None if no data
+    """
+    data_store = get_data_store()
+    if data_store.get('column_types') is None and data_store.get('df') is not None:
+        data_store['column_types'] = detect_columns(data_store['df'])
+    return data_store.get('column_types')
+
+
+def pandas_column_names(names: List[str]) -> List[str]:
+    """
+    Name CSV header columns the way pandas' read_csv does.
+    
+    Empty names become 'Unnamed: <position>' and repeated names get a '.1',
+    '.2', ... suffix, so both CSV readers produce the same columns.
+    
+    Args:
+        names: Header names as written in the file
+        
+    Returns:
+        List of column names
+    """
+    names = [name if name else f'Unnamed: {i}' for i, name in enumerate(names)]
+    header = set(names)
+    counts: Dict[str, int] = {}
+    for i, original in enumerate(names):
+        name = original
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[original] = count + 1
+            name = f'{original}.{count}'
+            # Suffixes already used by another header column are skipped
+            count = count + 1 if name in header else counts.get(name, 0)
+        names[i] = name
+        counts[name] = count + 1
+    return names
+
+
+def read_csv_file(stream) -> pd.DataFrame:
+    """
+    Parse a CSV file object into a DataFrame.
+    
+    The stream is handed straight to the parser so the upload is never
+    buffered in memory as a whole. Uses pyarrow's multithreaded CSV reader
+    when it is installed and falls back to pandas when pyarrow is missing or
+    rejects the file (e.g. ragged rows or invalid UTF-8), so pandas' error
+    handling still applies.
+    
+    Args:
+        stream: Seekable binary file object positioned at the start
+        
+    Returns:
+        Parsed DataFrame
+    """
+    if pacsv is not None:
+        try:
+            table = pacsv.read_csv(
+                pa.PythonFile(stream, mode='r'),
+                convert_options=pacsv.ConvertOptions(
+                    null_values=CSV_NA_VALUES,
+                    strings_can_be_null=True
+                )
+            )
+            # Arrow reads invalid UTF-8 as binary columns instead of failing,
+            # and converts timestamps with an offset to UTC where pandas keeps
+            # the text; both are left to pandas
+            if not any(
+                pa.types.is_binary(field.type)
+                or (pa.types.is_timestamp(field.type) and field.type.tz is not None)
+                for field in table.schema
+            ):
+                table = table.rename_columns(pandas_column_names(table.column_names))
+                # Free each Arrow column as soon as it has been converted so
+                # the file is not held in memory twice
+                return table.to_pandas(date_as_object=False, split_blocks=True,
+                                       self_destruct=True)
+        except pa.ArrowInvalid:
+            pass
+        stream.seek(0)
+    
+    return pd.read_csv(stream, encoding='utf-8')
+
+
+def is_blank_stream(stream, chunk_size: int = 64 * 1024) -> bool:
+    """
+    Check whether a file object contains nothing but whitespace.
+    
+    Reads in chunks and stops at the first non-whitespace byte, so only
+    leading blank space is scanned rather than the whole upload. The stream
+    is rewound to the start afterwards.
+    
+    Args:
+        stream: Seekable binary file object
+        chunk_size: Number of bytes read at a time
+        
+    Returns:
+        Boolean indicating if the stream is empty or whitespace-only
+    """
+    stream.seek(0)
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                return True
+            if chunk.strip():
+                return False
+    finally:
+        stream.seek(0)
 
 
 def is_data_loaded() -> bool:
@@ -60,9 +315,19 @@ def is_data_loaded() -> bool:
     Returns:
         Boolean indicating if data is loaded
     """
+    data_store = get_data_store()
     return data_store.get('uploaded', False) and data_store.get('df') is not None
 
 
+@app.after_request
+def set_session_cookie(response):
+    """Send the session cookie to clients that did not have one yet."""
+    if g.get('new_session'):
+        response.set_cookie(SESSION_COOKIE, g.session_id,
+                            httponly=True, samesite='Lax')
+    return response
+
+
 # ============================================
 # ROUTES - File Upload
 # ============================================
@@ -104,18 +369,16 @@ def upload_file():
         
         # Try to read the CSV file
         try:
-            # Read file content
-            content = file.read().decode('utf-8')
-            
-            # Check if file is empty
-            if not content.strip():
+            # Check if file is empty (or contains only whitespace)
+            stream = file.stream
+            if is_blank_stream(stream):
                 return jsonify({
                     'success': False,
                     'error': 'The uploaded file is empty.'
                 }), 400
             
-            # Parse CSV into DataFrame
-            df = pd.read_csv(StringIO(content))
+            # Parse CSV into DataFrame straight from the upload stream
+            df = read_csv_file(stream)
             
             # Validate that DataFrame has data
             if df.empty:
@@ -149,10 +412,14 @@ def upload_file():
         # Clean and preprocess the DataFrame
         df = clean_dataframe(df)
         
-        # Store in memory
+        # Store in memory, replacing the session's data store as a whole so
+        # concurrent requests never see a partially updated one
+        data_store = new_data_store()
         data_store['df'] = df
         data_store['filename'] = file.filename
         data_store['uploaded'] = True
+        data_store['column_types'] = detect_columns(df)
+        save_data_store(data_store)
         
         # Get basic info about the uploaded data
         info = get_dataframe_info(df)
@@ -191,15 +458,16 @@ def analyze_data():
             }), 400
         
         df = get_dataframe()
+        column_types = get_column_types()
         
         # Compute summary statistics
-        summary = compute_summary(df)
+        summary = compute_summary(df, column_types=column_types)
         
         # Generate quick insights
         insights = get_quick_insights(summary)
         
         # Get available chart types
-        available_charts = get_available_charts(df)
+        available_charts = get_available_charts(df, column_types=column_types)
         
         return jsonify({
             'success': True,
@@ -256,7 +524,8 @@ def visualize_data():
         df = get_dataframe()
         
         # Generate chart
-        result = generate_chart(df, chart_type, x_col=x_col, y_col=y_col)
+        result = generate_chart(df, chart_type, x_col=x_col, y_col=y_col,
+                                column_types=get_column_types())
         
         if result['success']:
             return jsonify(result)
@@ -338,7 +607,7 @@ def get_columns():
             }), 400
         
         df = get_dataframe()
-        column_types = detect_columns(df)
+        column_types = get_column_types()
         
         return jsonify({
             'success': True,
@@ -356,14 +625,14 @@ def get_columns():
 @app.route('/clear', methods=['POST'])
 def clear_data():
     """
-    Clear the stored data from memory.
+    Clear the current session's data from memory.
     
     Returns:
         JSON response indicating success
     """
-    data_store['df'] = None
-    data_store['filename'] = None
-    data_store['uploaded'] = False
+    with sessions_lock:
+        sessions.pop(get_session_id(), None)
+    g.data_store = new_data_store()
     
     return jsonify({
         'success': True,
@@ -379,6 +648,8 @@ def get_status():
     Returns:
         JSON response with status information
     """
+    data_store = get_data_store()
+    
     return jsonify({
         'success': True,
         'data_loaded': is_data_loaded(),
@@ -5,6 +5,7 @@ This module provides functions for generating interactive Plotly charts.
 Supports line, bar, scatter, and histogram charts.
 """
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -12,8 +13,77 @@ from typing import Dict, Any, Optional, List
 from backend.analysis.preprocessing import detect_columns
 
 
+# Constants for chart generation: upper bounds on points sent to the browser
+LINE_CHART_MAX_POINTS = 2000
+SCATTER_MAX_POINTS = 10_000
+
+
+def _axis_values(series: pd.Series) -> np.ndarray:
+    """
+    Convert an axis column to float64 for geometric calculations.
+    
+    Dates become nanosecond timestamps; non-numeric values fall back to
+    their row positions.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.to_numpy(dtype='datetime64[ns]').view('i8').astype(np.float64)
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype=np.float64)
+    return np.arange(len(series), dtype=np.float64)
+
+
+def _downsample_lttb(x: np.ndarray, y: np.ndarray, n_out: int = LINE_CHART_MAX_POINTS) -> np.ndarray:
+    """
+    Select points to keep with Largest-Triangle-Three-Buckets downsampling.
+    
+    The interior points are split into n_out - 2 buckets and from each bucket
+    the point forming the largest triangle with the previously kept point and
+    the next bucket's mean is kept, which preserves the visual shape of the
+    series. The first and last points are always kept.
+    
+    Args:
+        x: X values as float64
+        y: Y values as float64
+        n_out: Number of points to keep
+        
+    Returns:
+        Positions of the kept points, in increasing order
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    # Bucket b covers positions edges[b]:edges[b + 1]
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    
+    # Third triangle vertex for each bucket: the next bucket's mean, or the
+    # last point for the final bucket
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+    
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = n - 1
+    
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs(
+            (x[prev] - next_x[b]) * (y[lo:hi] - y[prev]) -
+            (x[prev] - x[lo:hi]) * (next_y[b] - y[prev])
+        )
+        prev = lo + int(np.argmax(area))
+        kept[b + 1] = prev
+    
+    return kept
+
+
 def generate_line_chart(df: pd.DataFrame, x_col: Optional[str] = None, 
-                        y_col: Optional[str] = None, title: str = "Line Chart") -> str:
+                        y_col: Optional[str] = None, title: str = "Line Chart",
+                        column_types: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
     """
     Generate an interactive line chart.
     
@@ -26,11 +96,13 @@ def generate_line_chart(df: pd.DataFrame, x_col: Optional[str] = None,
         x_col: Column name for X axis
         y_col: Column name for Y axis
         title: Chart title
+        column_types: Result of detect_columns(df), computed if not given
         
     Returns:
-        JSON string representation of the Plotly figure
+        Plotly figure as a dictionary (may contain NumPy arrays)
     """
-    column_types = detect_columns(df)
+    if column_types is None:
+        column_types = detect_columns(df)
     
     # Auto-select X column (prefer date, fallback to index)
     if x_col is None:
@@ -48,6 +120,12 @@ def generate_line_chart(df: pd.DataFrame, x_col: Optional[str] = None,
         else:
             raise ValueError("No numeric column available for Y axis")
     
+    # Downsample long series so the figure size does not grow with the data
+    if len(df) > LINE_CHART_MAX_POINTS and pd.api.types.is_numeric_dtype(df[y_col]):
+        df = df[list(dict.fromkeys([x_col, y_col]))].dropna()
+        kept = _downsample_lttb(_axis_values(df[x_col]), df[y_col].to_numpy(dtype=np.float64))
+        df = df.iloc[kept]
+    
     # Create line chart
     fig = px.line(
         df, 
@@ -69,11 +147,12 @@ def generate_line_chart(df: pd.DataFrame, x_col: Optional[str] = None,
     # Add markers for better visibility
     fig.update_traces(mode='lines+markers', marker=dict(size=6))
     
-    return fig.to_json()
+    return fig.to_plotly_json()
 
 
 def generate_bar_chart(df: pd.DataFrame, x_col: Optional[str] = None,
-                       y_col: Optional[str] = None, title: str = "Bar Chart") -> str:
+                       y_col: Optional[str] = None, title: str = "Bar Chart",
+                       column_types: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
     """
     Generate an interactive bar chart.
     
@@ -86,11 +165,13 @@ def generate_bar_chart(df: pd.DataFrame, x_col: Optional[str] = None,
         x_col: Column name for X axis (categories)
         y_col: Column name for Y axis (values)
         title: Chart title
+        column_types: Result of detect_columns(df), computed if not given
         
     Returns:
-        JSON string representation of the Plotly figure
+        Plotly figure as a dictionary (may contain NumPy arrays)
     """
-    column_types = detect_columns(df)
+    if column_types is None:
+        column_types = detect_columns(df)
     
     # Auto-select X column (prefer categorical)
     if x_col is None:
@@ -112,11 +193,15 @@ def generate_bar_chart(df: pd.DataFrame, x_col: Optional[str] = None,
     
     # Aggregate data if categorical
     if x_col in column_types['categorical']:
-        agg_df = df.groupby(x_col)[y_col].sum().reset_index()
-        # Show top categories if too many (configurable via max_categories parameter)
+        sums = df.groupby(x_col, sort=False, observed=True)[y_col].sum()
+        # Show top categories if too many (configurable via max_categories parameter);
+        # nlargest only partially sorts the groups
         max_categories = 30
-        if len(agg_df) > max_categories:
-            agg_df = agg_df.sort_values(y_col, ascending=False).head(max_categories)
+        if len(sums) > max_categories:
+            sums = sums.nlargest(max_categories)
+        else:
+            sums = sums.sort_index()
+        agg_df = sums.reset_index()
     else:
         agg_df = df[[x_col, y_col]].dropna()
     
@@ -138,11 +223,12 @@ def generate_bar_chart(df: pd.DataFrame, x_col: Optional[str] = None,
         yaxis_title=y_col.replace('_', ' ').title()
     )
     
-    return fig.to_json()
+    return fig.to_plotly_json()
 
 
 def generate_histogram(df: pd.DataFrame, col: Optional[str] = None,
-                       bins: int = 30, title: str = "Histogram") -> str:
+                       bins: int = 30, title: str = "Histogram",
+                       column_types: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
     """
     Generate a histogram for a numeric column.
     
@@ -151,11 +237,13 @@ def generate_histogram(df: pd.DataFrame, col: Optional[str] = None,
         col: Column name for histogram
         bins: Number of bins
         title: Chart title
+        column_types: Result of detect_columns(df), computed if not given
         
     Returns:
-        JSON string representation of the Plotly figure
+        Plotly figure as a dictionary (may contain NumPy arrays)
     """
-    column_types = detect_columns(df)
+    if column_types is None:
+        column_types = detect_columns(df)
     
     # Auto-select column (first numeric)
     if col is None:
@@ -181,12 +269,13 @@ def generate_histogram(df: pd.DataFrame, col: Optional[str] = None,
         yaxis_title='Frequency'
     )
     
-    return fig.to_json()
+    return fig.to_plotly_json()
 
 
 def generate_scatter_plot(df: pd.DataFrame, x_col: Optional[str] = None,
                           y_col: Optional[str] = None, color_col: Optional[str] = None,
-                          title: str = "Scatter Plot") -> str:
+                          title: str = "Scatter Plot",
+                          column_types: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
     """
     Generate an interactive scatter plot.
     
@@ -200,11 +289,13 @@ def generate_scatter_plot(df: pd.DataFrame, x_col: Optional[str] = None,
         y_col: Column name for Y axis
         color_col: Column name for color coding (optional)
         title: Chart title
+        column_types: Result of detect_columns(df), computed if not given
         
     Returns:
-        JSON string representation of the Plotly figure
+        Plotly figure as a dictionary (may contain NumPy arrays)
     """
-    column_types = detect_columns(df)
+    if column_types is None:
+        column_types = detect_columns(df)
     
     if len(column_types['numeric']) < 2:
         raise ValueError("Scatter plot requires at least 2 numeric columns")
@@ -222,6 +313,10 @@ def generate_scatter_plot(df: pd.DataFrame, x_col: Optional[str] = None,
         if df[potential_color].nunique() <= 10:
             color_col = potential_color
     
+    # Plot a fixed-size random sample of very large datasets
+    if len(df) > SCATTER_MAX_POINTS:
+        df = df.sample(n=SCATTER_MAX_POINTS, random_state=0)
+    
     # Create scatter plot
     fig = px.scatter(
         df,
@@ -243,11 +338,12 @@ def generate_scatter_plot(df: pd.DataFrame, x_col: Optional[str] = None,
     # Add trendline
     fig.update_traces(marker=dict(size=8, opacity=0.7))
     
-    return fig.to_json()
+    return fig.to_plotly_json()
 
 
 def generate_chart(df: pd.DataFrame, chart_type: str, 
                    x_col: Optional[str] = None, y_col: Optional[str] = None,
+                   column_types: Optional[Dict[str, List[str]]] = None,
                    **kwargs) -> Dict[str, Any]:
     """
     Main function to generate charts based on type.
@@ -257,12 +353,13 @@ def generate_chart(df: pd.DataFrame, chart_type: str,
         chart_type: Type of chart ('line', 'bar', 'histogram', 'scatter')
         x_col: Column name for X axis
         y_col: Column name for Y axis
+        column_types: Result of detect_columns(df), computed if not given
         **kwargs: Additional arguments passed to specific chart functions
         
     Returns:
         Dictionary with:
         - success: Boolean
-        - chart_json: JSON string of the chart (if successful)
+        - chart_json: Plotly figure dictionary of the chart (if successful)
         - error: Error message (if failed)
     """
     chart_functions = {
@@ -280,9 +377,10 @@ def generate_chart(df: pd.DataFrame, chart_type: str,
     
     try:
         if chart_type == 'histogram':
-            chart_json = chart_functions[chart_type](df, col=x_col, **kwargs)
+            chart_json = chart_functions[chart_type](df, col=x_col, column_types=column_types, **kwargs)
         else:
-            chart_json = chart_functions[chart_type](df, x_col=x_col, y_col=y_col, **kwargs)
+            chart_json = chart_functions[chart_type](df, x_col=x_col, y_col=y_col,
+                                                     column_types=column_types, **kwargs)
         
         return {
             'success': True,
@@ -297,17 +395,20 @@ def generate_chart(df: pd.DataFrame, chart_type: str,
         }
 
 
-def get_available_charts(df: pd.DataFrame) -> Dict[str, bool]:
+def get_available_charts(df: pd.DataFrame,
+                         column_types: Optional[Dict[str, List[str]]] = None) -> Dict[str, bool]:
     """
     Determine which chart types are available for the given DataFrame.
     
     Args:
         df: Input DataFrame
+        column_types: Result of detect_columns(df), computed if not given
         
     Returns:
         Dictionary mapping chart types to availability
     """
-    column_types = detect_columns(df)
+    if column_types is None:
+        column_types = detect_columns(df)
     num_count = len(column_types['numeric'])
     
     return {
@@ -594,8 +594,8 @@ async function loadChart(chartType, xCol = null, yCol = null) {
         const result = await response.json();
         
         if (result.success) {
-            // Parse and render the Plotly chart
-            const chartData = JSON.parse(result.chart_json);
+            // Render the Plotly chart (sent as a figure object)
+            const chartData = result.chart_json;
             
             // Configure responsive layout
             chartData.layout = {